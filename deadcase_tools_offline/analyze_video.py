@@ -10,14 +10,37 @@ brightness and frame-to-frame motion within each shot.
 from __future__ import annotations
 
 import argparse
-import json
+import itertools
+import multiprocessing
+import queue
 import sys
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import cv2
 import numpy as np
+from json_output import write_json_array
+
+try:
+    import av
+except ImportError:  # PyAV is optional; OpenCV decodes the video without it
+    av = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; batch_metrics falls back to OpenCV/NumPy
+    njit = None
+
+T = TypeVar("T")
+
+# Sampled frames analyzed together by batch_metrics
+BATCH_SIZE = 64
+# Batches queued between the reader thread and detect_shots
+PREFETCH_BATCHES = 4
+# Seconds of footage the adaptive threshold statistics mostly reflect
+ADAPTIVE_WINDOW = 10.0
 
 
 @dataclass
@@ -54,12 +77,59 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--input", required=True, help="Path to the input video file")
     parser.add_argument("--output", required=True, help="Path for the output JSON file")
     parser.add_argument("--threshold", type=float, default=0.45, help="Shot change threshold (histogram distance)")
+    parser.add_argument(
+        "--adaptive-k",
+        type=float,
+        default=3.0,
+        help="Raise the threshold to mean + k * std of the recent non-cut distances (0 disables)",
+    )
+    parser.add_argument(
+        "--motion-gate",
+        type=float,
+        default=0.0,
+        help="Skip the histogram comparison for frames whose motion is below this value (off by default)",
+    )
     parser.add_argument(
         "--min-shot-duration",
         type=float,
         default=0.5,
         help="Minimum shot duration in seconds to avoid tiny segments",
     )
+    parser.add_argument(
+        "--analysis-width",
+        type=int,
+        default=320,
+        help="Frame width used for analysis (frames are downscaled first; 0 keeps the full resolution)",
+    )
+    parser.add_argument(
+        "--sample-stride",
+        type=int,
+        default=2,
+        help="Analyze every Nth frame; skipped frames are grabbed but not converted",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; the video is split into one frame range per worker",
+    )
+    parser.add_argument(
+        "--worker-timeout",
+        type=float,
+        default=1800.0,
+        help="Seconds to wait for each worker's frame range before aborting (0 waits indefinitely)",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=["auto", "pyav", "opencv"],
+        default="auto",
+        help="Video decoder; PyAV reads the luma plane directly (auto uses it when installed)",
+    )
+    parser.add_argument(
+        "--opencl",
+        action="store_true",
+        help="Downscale and convert frames through OpenCV's OpenCL T-API (cv2.UMat; OpenCV decoder only)",
+    )
     return parser.parse_args()
 
 
@@ -72,64 +142,660 @@ def ensure_video(path: Path) -> cv2.VideoCapture:
     return cap
 
 
-def histogram_distance(frame_a: np.ndarray, frame_b: np.ndarray) -> float:
+def open_container(path: Path) -> "av.container.InputContainer":
+    if not path.exists():
+        raise FileNotFoundError(f"Input video not found: {path}")
+    try:
+        container = av.open(str(path))
+    except av.FFmpegError as exc:
+        raise RuntimeError(f"Could not open video: {path}") from exc
+    if not container.streams.video:
+        container.close()
+        raise RuntimeError(f"No video stream in: {path}")
+    return container
+
+
+def analysis_size(width: int, height: int, analysis_width: int) -> Optional[Tuple[int, int]]:
+    if 0 < analysis_width < width:
+        return analysis_width, max(int(round(height * analysis_width / width)), 1)
+    return None
+
+
+def to_analysis_gray(
+    frame: np.ndarray,
+    analysis_width: int,
+    use_opencl: bool = False,
+    resized: Optional[np.ndarray] = None,
+    gray: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Downscale and convert a BGR frame; `resized` and `gray` are reused as outputs when given."""
+    height, width = frame.shape[:2]
+    size = analysis_size(width, height, analysis_width)
+    if use_opencl:
+        # The full-resolution resize/convert runs on the device; only the
+        # small grayscale result is copied back for the metrics.
+        src = cv2.UMat(frame)
+        if size is not None:
+            src = cv2.resize(src, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(src, cv2.COLOR_BGR2GRAY).get()
+    if size is not None:
+        frame = cv2.resize(frame, size, dst=resized, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+
+
+# 8-bit planar YUV formats whose first plane is the luma channel
+LUMA_PLANE_FORMATS = {"yuv420p", "yuv422p", "yuv444p", "yuvj420p", "yuvj422p", "yuvj444p", "nv12", "nv21"}
+
+
+def luma_to_analysis_gray(
+    frame: "av.VideoFrame",
+    analysis_width: int,
+    gray: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Downscaled luma of a decoded frame; `gray` is reused as the output when given."""
+    size = analysis_size(frame.width, frame.height, analysis_width)
+    if frame.format.name not in LUMA_PLANE_FORMATS:
+        converted = frame.to_ndarray(format="gray")
+        return cv2.resize(converted, size, dst=gray, interpolation=cv2.INTER_AREA) if size is not None else converted
+
+    # Zero-copy view of the Y plane; rows are padded to line_size
+    plane = frame.planes[0]
+    rows = np.frombuffer(plane, dtype=np.uint8, count=plane.line_size * frame.height)
+    luma = rows.reshape(frame.height, plane.line_size)[:, : frame.width]
+    if size is not None:
+        gray = cv2.resize(luma, size, dst=gray, interpolation=cv2.INTER_AREA)
+    elif gray is not None and gray.shape == luma.shape:
+        np.copyto(gray, luma)
+    else:
+        gray = luma.copy()
+    if not frame.format.name.startswith("yuvj"):
+        # Limited-range luma (16-235) is stretched to 0-255 to match BGR2GRAY brightness
+        gray = cv2.convertScaleAbs(gray, dst=gray, alpha=255.0 / 219.0, beta=-16.0 * 255.0 / 219.0)
+    return gray
+
+
+def gray_histogram(frame: np.ndarray) -> np.ndarray:
     hist_size = 32
-    hist_range = [0, 256]
-    hist_a = cv2.calcHist([frame_a], [0], None, [hist_size], hist_range)
-    hist_b = cv2.calcHist([frame_b], [0], None, [hist_size], hist_range)
-    cv2.normalize(hist_a, hist_a)
-    cv2.normalize(hist_b, hist_b)
-    score = cv2.compareHist(hist_a, hist_b, cv2.HISTCMP_CORREL)
-    return float(1.0 - score)
-
-
-def detect_shots(cap: cv2.VideoCapture, fps: float, threshold: float, min_shot_frames: int) -> List[ShotMetrics]:
-    shots: List[ShotMetrics] = []
-    ret, prev_frame = cap.read()
-    if not ret:
-        return shots
-
-    frame_index = 0
-    gray_prev = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-    current_shot = ShotMetrics(start_frame=0, end_frame=0, fps=fps)
-    current_shot.brightness_sum = gray_prev.mean() / 255.0
-    current_shot.motion_sum = 0.0
-    current_shot.frames = 1
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
+    # bincount over the raw uint8 values, then fold the 256 levels into 32 bins
+    counts = np.bincount(frame.ravel(), minlength=256)
+    hist = counts.reshape(hist_size, -1).sum(axis=1).astype(np.float32)
+    hist /= max(float(hist.sum()), 1.0)
+    return hist
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _batch_metrics_jit(batch, gray_prev):
+        count, height, width = batch.shape
+        size = max(height * width, 1)
+        brightness = np.empty(count)
+        motion = np.empty(count)
+        hists = np.empty((count, 32), dtype=np.float32)
+        # Four counter lanes, so consecutive pixels in the same bin never wait
+        # on each other's increment; they are summed once per frame.
+        lanes = np.empty((4, 32), dtype=np.int32)
+        prev = gray_prev
+        for i in range(count):
+            gray = batch[i]
+            lanes[:] = 0
+            pixel_sum = 0
+            diff_sum = 0
+            for y in range(height):
+                row = gray[y]
+                prev_row = prev[y]
+                x = 0
+                while x + 4 <= width:
+                    v0 = np.int32(row[x])
+                    v1 = np.int32(row[x + 1])
+                    v2 = np.int32(row[x + 2])
+                    v3 = np.int32(row[x + 3])
+                    pixel_sum += v0 + v1 + v2 + v3
+                    diff_sum += (
+                        abs(v0 - np.int32(prev_row[x]))
+                        + abs(v1 - np.int32(prev_row[x + 1]))
+                        + abs(v2 - np.int32(prev_row[x + 2]))
+                        + abs(v3 - np.int32(prev_row[x + 3]))
+                    )
+                    lanes[0, v0 >> 3] += 1
+                    lanes[1, v1 >> 3] += 1
+                    lanes[2, v2 >> 3] += 1
+                    lanes[3, v3 >> 3] += 1
+                    x += 4
+                while x < width:
+                    value = np.int32(row[x])
+                    pixel_sum += value
+                    diff_sum += abs(value - np.int32(prev_row[x]))
+                    lanes[0, value >> 3] += 1
+                    x += 1
+            brightness[i] = pixel_sum / (255.0 * size)
+            motion[i] = diff_sum / (255.0 * size)
+            for bin_index in range(32):
+                total = lanes[0, bin_index] + lanes[1, bin_index] + lanes[2, bin_index] + lanes[3, bin_index]
+                hists[i, bin_index] = total / size
+            prev = gray
+        return brightness, motion, hists
+
+else:
+    _batch_metrics_jit = None
+
+
+def batch_metrics(
+    batch: np.ndarray,
+    gray_prev: np.ndarray,
+    diff: Optional[np.ndarray] = None,
+    motion_gate: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-frame (brightness, motion, histogram) arrays for a (N, H, W) batch.
+
+    Motion of the first frame is measured against `gray_prev`. With numba
+    installed this is a single fused pass over the batch; otherwise `diff`, an
+    (N - 1, H * W) uint8 array, is reused for the frame differences when given,
+    and histograms are only built where a frame with motion >= `motion_gate`
+    needs them (plus the last frame, which the next batch compares against).
+    Skipped histogram rows are zero.
+    """
+    if _batch_metrics_jit is not None:
+        return _batch_metrics_jit(batch, gray_prev)
+    count = len(batch)
+    pixels = batch.reshape(count, -1)
+    brightness = pixels.mean(axis=1) / 255.0
+    motion = np.empty(count)
+    motion[0] = cv2.norm(batch[0], gray_prev, cv2.NORM_L1) / (255.0 * batch[0].size)
+    if count > 1:
+        if diff is not None:
+            diff = diff[: count - 1]
+        # Summed like cv2.norm above, so a frame's motion does not depend on its position in the batch
+        motion[1:] = cv2.absdiff(pixels[1:], pixels[:-1], dst=diff).sum(axis=1) / (255.0 * pixels.shape[1])
+    compared = motion >= motion_gate
+    needed = compared.copy()
+    needed[:-1] |= compared[1:]
+    needed[-1] = True
+    hists = np.zeros((count, 32), dtype=np.float32)
+    for index in np.flatnonzero(needed):
+        hists[index] = gray_histogram(batch[index])
+    return brightness, motion, hists
+
+
+def histogram_distances(hists: np.ndarray, hist_prev: np.ndarray) -> np.ndarray:
+    """1 - correlation of every histogram with its predecessor, as cv2.HISTCMP_CORREL."""
+    current = hists.astype(np.float64)
+    previous = np.vstack([hist_prev[np.newaxis], hists[:-1]]).astype(np.float64)
+    current -= current.mean(axis=1, keepdims=True)
+    previous -= previous.mean(axis=1, keepdims=True)
+    numerator = (current * previous).sum(axis=1)
+    denominator = np.sqrt((current * current).sum(axis=1) * (previous * previous).sum(axis=1))
+    score = np.ones_like(numerator)
+    np.divide(numerator, denominator, out=score, where=denominator > np.finfo(np.float64).eps)
+    return 1.0 - score
+
+
+def read_gray_frames(
+    cap: cv2.VideoCapture,
+    analysis_width: int,
+    sample_stride: int,
+    use_opencl: bool = False,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """Yield (frame_index, gray) for every sampled frame in [start_frame, end_frame).
+
+    Once the range is exhausted, a final (frame_index, None) item reports the
+    index of the last decoded frame. The yielded gray array is reused for the
+    next frame; copy it to keep it.
+    """
+    sample_stride = max(sample_stride, 1)
+    if start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    resized: Optional[np.ndarray] = None
+    gray: Optional[np.ndarray] = None
+    frame_index = start_frame
+    while end_frame is None or frame_index < end_frame:
+        if (frame_index - start_frame) % sample_stride == 0:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if gray is None and not use_opencl:
+                height, width = frame.shape[:2]
+                out_width, out_height = analysis_size(width, height, analysis_width) or (width, height)
+                resized = np.empty((out_height, out_width, 3), dtype=np.uint8)
+                gray = np.empty((out_height, out_width), dtype=np.uint8)
+            gray = to_analysis_gray(frame, analysis_width, use_opencl, resized, gray)
+            yield frame_index, gray
+        elif not cap.grab():
             break
         frame_index += 1
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if frame_index > start_frame:
+        yield frame_index - 1, None
+
+
+def read_luma_frames(
+    container: "av.container.InputContainer",
+    analysis_width: int,
+    sample_stride: int,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    fps: float = 0.0,
+) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """PyAV counterpart of read_gray_frames that analyzes the decoded luma plane.
+
+    A non-zero `start_frame` seeks to the preceding keyframe and uses the frame
+    timestamps (and `fps`) to find where the range begins.
+    """
+    sample_stride = max(sample_stride, 1)
+    stream = container.streams.video[0]
+    stream.thread_type = "AUTO"
+    first_pts = stream.start_time or 0
+    if start_frame and fps:
+        container.seek(first_pts + int(start_frame / fps / stream.time_base), stream=stream)
+
+    gray: Optional[np.ndarray] = None
+    frame_index: Optional[int] = None
+    last_frame: Optional[int] = None
+    for frame in container.decode(stream):
+        if frame_index is not None:
+            frame_index += 1
+        elif start_frame and fps and frame.pts is not None:
+            position = int(round(float((frame.pts - first_pts) * stream.time_base) * fps))
+            if position < start_frame:
+                continue
+            frame_index = position
+        else:
+            frame_index = start_frame
+        if end_frame is not None and frame_index >= end_frame:
+            break
+        last_frame = frame_index
+        if (frame_index - start_frame) % sample_stride == 0:
+            gray = luma_to_analysis_gray(frame, analysis_width, gray)
+            yield frame_index, gray
+    if last_frame is not None:
+        yield last_frame, None
+
+
+def batch_frames(
+    frames: Iterator[Tuple[int, Optional[np.ndarray]]],
+    batch_size: int = BATCH_SIZE,
+    buffer_count: int = PREFETCH_BATCHES + 2,
+) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Group sampled frames into (indices, (N, H, W) batch) pairs.
+
+    Frames are copied into a ring of `buffer_count` preallocated batch arrays,
+    so a yielded batch stays valid while `buffer_count - 1` newer batches are
+    produced; the default covers the prefetch queue plus the batch being
+    analyzed. The end-of-video item of the reader is passed through as
+    ([frame_index], None).
+    """
+    buffers: List[np.ndarray] = []
+    slot = 0
+    indices: List[int] = []
+    for frame_index, gray in frames:
+        if gray is not None:
+            if not buffers:
+                buffers = [np.empty((batch_size,) + gray.shape, dtype=np.uint8) for _ in range(buffer_count)]
+            buffers[slot][len(indices)] = gray
+            indices.append(frame_index)
+            if len(indices) < batch_size:
+                continue
+        if indices:
+            yield np.asarray(indices), buffers[slot][: len(indices)]
+            slot = (slot + 1) % buffer_count
+            indices = []
+        if gray is None:
+            yield np.asarray([frame_index]), None
+
+
+def prefetch(items: Iterator[T], maxsize: int = 16) -> Iterator[T]:
+    """Drain `items` on a reader thread so decoding overlaps with the consumer.
+
+    Closing the returned generator stops the reader and waits for it, so the
+    source behind `items` can be released safely afterwards.
+    """
+    buffer: "queue.Queue[Optional[T]]" = queue.Queue(maxsize=maxsize)
+    errors: List[BaseException] = []
+    stop = threading.Event()
+
+    def put(item: Optional[T]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    break
+        except BaseException as exc:  # re-raised in the consumer
+            errors.append(exc)
+        finally:
+            put(None)
+
+    thread = threading.Thread(target=reader, name="frame-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        stop.set()
+        # Free a reader blocked on a full queue; it exits after its current item
+        while True:
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                break
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+# Per-frame (brightness, motion, histogram distance) arrays of one batch
+FrameMetrics = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def measure_batches(
+    batches: Iterable[Tuple[np.ndarray, Optional[np.ndarray]]],
+    sample_stride: int = 1,
+    motion_gate: float = 0.0,
+) -> Iterator[Tuple[np.ndarray, Optional[FrameMetrics]]]:
+    """Measure every frame in the batches produced by batch_frames.
+
+    Each frame is compared with the preceding sampled frame; the first one with
+    itself, which gives zero motion and distance. Motion is measured per source
+    frame, so it does not depend on `sample_stride`. The end-of-video item is
+    passed through as ([frame_index], None).
+    """
+    sample_stride = max(sample_stride, 1)
+    gray_prev: Optional[np.ndarray] = None
+    hist_prev: Optional[np.ndarray] = None
+    diff: Optional[np.ndarray] = None
+    for indices, batch in batches:
+        if batch is None:
+            yield indices, None
+            continue
+        if gray_prev is None:
+            # Batch buffers are recycled by the reader, so the previous frame is kept in its own buffer
+            gray_prev = batch[0].copy()
+            hist_prev = gray_histogram(gray_prev)
+            diff = np.empty((max(len(batch) - 1, 1), gray_prev.size), dtype=np.uint8)
+
+        brightness, motion, hists = batch_metrics(batch, gray_prev, diff, motion_gate * sample_stride)
+        # Sampled frames are sample_stride source frames apart; motion is reported per source frame
+        motion /= sample_stride
+        distances = histogram_distances(hists, hist_prev)
+        np.copyto(gray_prev, batch[-1])
+        hist_prev = hists[-1]
+        yield indices, (brightness, motion, distances)
+
+
+def cut_shots(
+    measured: Iterable[Tuple[np.ndarray, Optional[FrameMetrics]]],
+    fps: float,
+    threshold: float,
+    min_shot_frames: int,
+    sample_stride: int = 1,
+    adaptive_k: float = 0.0,
+    motion_gate: float = 0.0,
+) -> Iterator[ShotMetrics]:
+    """Split the frames measured by measure_batches into shots, yielding each shot once it ends.
+
+    With `adaptive_k` > 0 a cut needs a distance above both `threshold` and
+    mean + adaptive_k * std of the recent distances below the cut threshold,
+    which suppresses false cuts in noisy footage. The statistics are weighted
+    towards the last ADAPTIVE_WINDOW seconds, so a noisy section does not raise
+    the threshold for the rest of the video. Frames with motion below
+    `motion_gate` are nearly identical to their predecessor and are never
+    compared for a cut.
+    """
+    sample_stride = max(sample_stride, 1)
+    current_shot: Optional[ShotMetrics] = None
+    # Running mean/variance of the distances below the cut threshold: a plain
+    # average for the first samples, then exponentially weighted over ADAPTIVE_WINDOW
+    distance_count = 0
+    distance_mean = 0.0
+    distance_var = 0.0
+    distance_decay = min(sample_stride / (fps * ADAPTIVE_WINDOW), 1.0) if fps else 1.0
+    cut_threshold = threshold
+    last_frame = 0  # index of the last decoded frame
+    for indices, metrics in measured:
+        if metrics is None:
+            last_frame = int(indices[0])
+            continue
+        if current_shot is None:
+            current_shot = ShotMetrics(start_frame=int(indices[0]), end_frame=int(indices[0]), fps=fps)
+
+        brightness, motion, distances = metrics
+        compared = motion >= motion_gate
+        for frame_index, frame_brightness, frame_motion, distance, frame_compared in zip(
+            indices.tolist(), brightness.tolist(), motion.tolist(), distances.tolist(), compared.tolist()
+        ):
+            last_frame = frame_index
+            # Update metrics for current shot
+            current_shot.brightness_sum += frame_brightness
+            current_shot.motion_sum += frame_motion
+            current_shot.frames += 1
+            if not frame_compared:
+                continue
+
+            # Detect potential cut
+            if distance > cut_threshold and current_shot.frames * sample_stride >= min_shot_frames:
+                current_shot.end_frame = frame_index
+                yield current_shot
+                current_shot = ShotMetrics(start_frame=frame_index, end_frame=frame_index, fps=fps)
+            elif adaptive_k > 0 and distance <= cut_threshold:
+                # Distances over the threshold that were only held back by
+                # min_shot_frames are likely cuts and stay out of the statistics
+                distance_count += 1
+                weight = max(1.0 / distance_count, distance_decay)
+                delta = distance - distance_mean
+                distance_mean += weight * delta
+                distance_var = (1.0 - weight) * (distance_var + weight * delta * delta)
+                cut_threshold = max(distance_mean + adaptive_k * distance_var ** 0.5, threshold)
+
+    if current_shot is None:
+        return
 
-        # Update metrics for current shot
-        brightness = gray.mean() / 255.0
-        diff = cv2.absdiff(gray, gray_prev)
-        motion = float(diff.mean() / 255.0)
-        current_shot.brightness_sum += brightness
-        current_shot.motion_sum += motion
-        current_shot.frames += 1
+    # finalize last shot
+    current_shot.end_frame = last_frame + 1
+    yield current_shot
 
-        # Detect potential cut
-        distance = histogram_distance(gray, gray_prev)
-        if distance > threshold and current_shot.frames >= min_shot_frames:
-            current_shot.end_frame = frame_index
-            shots.append(current_shot)
-            current_shot = ShotMetrics(start_frame=frame_index, end_frame=frame_index, fps=fps)
 
-        gray_prev = gray
+def detect_shots(
+    batches: Iterator[Tuple[np.ndarray, Optional[np.ndarray]]],
+    fps: float,
+    threshold: float,
+    min_shot_frames: int,
+    sample_stride: int = 1,
+    adaptive_k: float = 0.0,
+    motion_gate: float = 0.0,
+) -> Iterator[ShotMetrics]:
+    """Detect shots in the frame batches produced by batch_frames, yielding each shot once it ends."""
+    measured = measure_batches(batches, sample_stride, motion_gate)
+    return cut_shots(measured, fps, threshold, min_shot_frames, sample_stride, adaptive_k, motion_gate)
 
-    # finalize last shot
-    current_shot.end_frame = frame_index + 1
-    shots.append(current_shot)
-    return shots
 
+@dataclass
+class VideoSource:
+    frames: Iterator[Tuple[int, Optional[np.ndarray]]]
+    fps: float
+    frame_count: int
+    release: Callable[[], None]
+
+
+def open_source(
+    path: Path,
+    use_pyav: bool,
+    analysis_width: int,
+    sample_stride: int,
+    use_opencl: bool = False,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+) -> VideoSource:
+    if use_pyav:
+        container = open_container(path)
+        stream = container.streams.video[0]
+        fps = float(stream.average_rate or 0) or 24.0
+        frame_count = stream.frames
+        if not frame_count and stream.duration:
+            frame_count = int(float(stream.duration * stream.time_base) * fps)
+        frames = read_luma_frames(container, analysis_width, sample_stride, start_frame, end_frame, fps)
+        return VideoSource(frames, fps, frame_count, container.close)
+
+    cap = ensure_video(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 24.0
+    frame_count = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+    frames = read_gray_frames(cap, analysis_width, sample_stride, use_opencl, start_frame, end_frame)
+    return VideoSource(frames, fps, frame_count, cap.release)
 
-def write_output(shots: List[ShotMetrics], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        json.dump([shot.to_dict() for shot in shots], fh, indent=2)
+
+@dataclass
+class RangeTask:
+    path: Path
+    use_pyav: bool
+    analysis_width: int
+    sample_stride: int
+    use_opencl: bool
+    motion_gate: float
+    start_frame: int
+    end_frame: Optional[int]
+
+
+@dataclass
+class RangeResult:
+    measured: List[Tuple[np.ndarray, FrameMetrics]]
+    first_gray: Optional[np.ndarray]
+    last_gray: Optional[np.ndarray]
+    last_frame: Optional[int]
+
+
+def analyze_range(task: RangeTask) -> RangeResult:
+    """Worker: measure the frames of one frame range.
+
+    Cuts are not decided here, as the open shot and the adaptive threshold at
+    the range start depend on the frames before it. The first and last sampled
+    frame are returned so stitch_ranges can measure the frame at the range edge.
+    """
+    if task.use_opencl:
+        cv2.ocl.setUseOpenCL(True)
+    source = open_source(
+        task.path,
+        task.use_pyav,
+        task.analysis_width,
+        task.sample_stride,
+        task.use_opencl,
+        task.start_frame,
+        task.end_frame,
+    )
+    edges: List[np.ndarray] = []
+
+    def track_edges(frames: Iterator[Tuple[int, Optional[np.ndarray]]]) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        for frame_index, gray in frames:
+            if gray is not None:
+                # The reader reuses its frame buffer, so the edge frames are copied
+                if edges:
+                    np.copyto(edges[1], gray)
+                else:
+                    edges.extend([gray.copy(), gray.copy()])
+            yield frame_index, gray
+
+    result = RangeResult(measured=[], first_gray=None, last_gray=None, last_frame=None)
+    batches = prefetch(batch_frames(track_edges(source.frames), BATCH_SIZE), maxsize=PREFETCH_BATCHES)
+    try:
+        for indices, metrics in measure_batches(batches, task.sample_stride, task.motion_gate):
+            if metrics is None:
+                result.last_frame = int(indices[0])
+            else:
+                result.measured.append((indices, metrics))
+    finally:
+        # The reader thread must be done with the decoder before it is released
+        batches.close()
+        source.release()
+    if edges:
+        result.first_gray, result.last_gray = edges[0], edges[-1]
+    return result
+
+
+def stitch_ranges(
+    results: Iterable[RangeResult],
+    sample_stride: int,
+) -> Iterator[Tuple[np.ndarray, Optional[FrameMetrics]]]:
+    """Join per-range measurements into the stream measure_batches yields for the whole video.
+
+    A worker compares the first frame of its range with itself; its motion and
+    distance are measured again against the last frame of the preceding range.
+    """
+    sample_stride = max(sample_stride, 1)
+    last_gray: Optional[np.ndarray] = None
+    last_frame: Optional[int] = None
+    for result in results:
+        if not result.measured:
+            continue
+        if last_gray is not None:
+            # Measured like the pair would be inside a batch
+            pair = np.stack([last_gray, result.first_gray])
+            _, motion, hists = batch_metrics(pair, last_gray)
+            _, (_, first_motion, first_distance) = result.measured[0]
+            first_motion[0] = motion[1] / sample_stride
+            first_distance[0] = histogram_distances(hists, hists[0])[1]
+        yield from result.measured
+        last_gray = result.last_gray
+        last_frame = result.last_frame
+    if last_frame is not None:
+        yield np.asarray([last_frame]), None
+
+
+def detect_shots_parallel(
+    path: Path,
+    workers: int,
+    frame_count: int,
+    fps: float,
+    use_pyav: bool,
+    analysis_width: int,
+    sample_stride: int,
+    use_opencl: bool,
+    threshold: float,
+    adaptive_k: float,
+    motion_gate: float,
+    min_shot_frames: int,
+    timeout: Optional[float] = None,
+) -> Iterator[ShotMetrics]:
+    """Measure [0, frame_count) in one range per worker process and cut the joined frames into shots.
+
+    The workers do the decoding and per-frame metrics; cut_shots runs over the
+    stitched measurements in this process, so the shots match a serial run.
+    Waiting longer than `timeout` seconds for a range raises
+    multiprocessing.TimeoutError and terminates the pool.
+    """
+    sample_stride = max(sample_stride, 1)
+    # Range starts stay on the sampling grid, so the same frames are analyzed as in a serial run
+    chunk = -(-frame_count // workers)
+    chunk = -(-chunk // sample_stride) * sample_stride
+    starts = list(range(0, frame_count, chunk))
+    tasks = [
+        RangeTask(
+            path=path,
+            use_pyav=use_pyav,
+            analysis_width=analysis_width,
+            sample_stride=sample_stride,
+            use_opencl=use_opencl,
+            motion_gate=motion_gate,
+            start_frame=start,
+            # The reported frame count can be short; the last range reads to the end
+            end_frame=start + chunk if start + chunk < frame_count else None,
+        )
+        for start in starts
+    ]
+    # Forked workers inherit the reader threads and OpenCV/FFmpeg locks of this process and can deadlock
+    with multiprocessing.get_context("spawn").Pool(len(tasks)) as pool:
+        # imap keeps range order and hands over each result as soon as it and its predecessors are done
+        results = pool.imap(analyze_range, tasks)
+        measured = stitch_ranges((results.next(timeout) for _ in tasks), sample_stride)
+        yield from cut_shots(measured, fps, threshold, min_shot_frames, sample_stride, adaptive_k, motion_gate)
 
 
 def main() -> None:
@@ -137,24 +803,74 @@ def main() -> None:
     video_path = Path(args.input)
     output_path = Path(args.output)
 
+    use_pyav = args.decoder == "pyav" or (args.decoder == "auto" and av is not None)
+    if use_pyav and av is None:
+        print("PyAV is not installed; use --decoder opencv.", file=sys.stderr)
+        sys.exit(1)
+
+    use_opencl = args.opencl and not use_pyav and cv2.ocl.haveOpenCL()
+    if args.opencl and not use_opencl:
+        print("OpenCL is not available for this decoder; analyzing on the CPU.", file=sys.stderr)
+    cv2.ocl.setUseOpenCL(use_opencl)
+
     try:
-        cap = ensure_video(video_path)
+        source = open_source(video_path, use_pyav, args.analysis_width, args.sample_stride, use_opencl)
     except (FileNotFoundError, RuntimeError) as exc:
         print(str(exc), file=sys.stderr)
         sys.exit(1)
 
-    fps = cap.get(cv2.CAP_PROP_FPS) or 24.0
+    fps = source.fps
     min_shot_frames = max(int(fps * args.min_shot_duration), 1)
 
-    shots = detect_shots(cap, fps, threshold=args.threshold, min_shot_frames=min_shot_frames)
-    cap.release()
-
-    if not shots:
-        print("No frames detected; no shots generated.", file=sys.stderr)
+    batches: Optional[Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]] = None
+    if args.workers > 1 and source.frame_count > 0:
+        source.release()
+        shots = detect_shots_parallel(
+            video_path,
+            args.workers,
+            source.frame_count,
+            fps,
+            use_pyav,
+            analysis_width=args.analysis_width,
+            sample_stride=args.sample_stride,
+            use_opencl=use_opencl,
+            threshold=args.threshold,
+            adaptive_k=args.adaptive_k,
+            motion_gate=args.motion_gate,
+            min_shot_frames=min_shot_frames,
+            timeout=args.worker_timeout or None,
+        )
+    else:
+        # Decoding, downscaling and batching run on a reader thread; detect_shots only does the analysis
+        batches = prefetch(batch_frames(source.frames, BATCH_SIZE), maxsize=PREFETCH_BATCHES)
+        shots = detect_shots(
+            batches,
+            fps,
+            threshold=args.threshold,
+            min_shot_frames=min_shot_frames,
+            sample_stride=args.sample_stride,
+            adaptive_k=args.adaptive_k,
+            motion_gate=args.motion_gate,
+        )
+
+    # Shots are produced lazily, so the source stays open while they are written
+    try:
+        first_shot = next(shots, None)
+        if first_shot is None:
+            print("No frames detected; no shots generated.", file=sys.stderr)
+            sys.exit(1)
+        shot_dicts = (shot.to_dict() for shot in itertools.chain([first_shot], shots))
+        count = write_json_array(shot_dicts, output_path)
+    except multiprocessing.TimeoutError:
+        print(f"A worker did not finish its frame range within {args.worker_timeout:g} s.", file=sys.stderr)
         sys.exit(1)
+    finally:
+        shots.close()
+        if batches is not None:
+            batches.close()
+        source.release()
 
-    write_output(shots, output_path)
-    print(f"Wrote {len(shots)} shots to {output_path}")
+    print(f"Wrote {count} shots to {output_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""
+Streaming JSON array output shared by analyze_video.py and offline_director.py.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is the fallback
+    orjson = None
+
+
+def dump_array_item(item: dict) -> bytes:
+    """Serialize one JSON array member with the layout of an indent=2 dump of the whole array."""
+    if orjson is not None:
+        return orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ")
+    return json.dumps(item, indent=2).replace("\n", "\n  ").encode("utf-8")
+
+
+def write_json_array(items: Iterable[dict], output_path: Path) -> int:
+    """Write items to a JSON array as they arrive; returns the number of items written.
+
+    The array is streamed into a temporary file next to `output_path`, which
+    replaces the output only once it is complete. An error or interrupt leaves
+    the previous file untouched.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    count = 0
+    try:
+        with tmp_path.open("wb") as fh:
+            fh.write(b"[")
+            for item in items:
+                fh.write(b",\n  " if count else b"\n  ")
+                fh.write(dump_array_item(item))
+                count += 1
+            fh.write(b"\n]" if count else b"]")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return count
@@ -7,23 +7,37 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterator
+
+import numpy as np
+from json_output import write_json_array
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is the fallback
+    orjson = None
 
 
 @dataclass
-class Shot:
-    start: float
-    end: float
-    avg_brightness: float
-    motion: float
+class ShotTable:
+    """Shot metadata stored column-wise so the rules can run as array masks."""
+
+    start: np.ndarray
+    end: np.ndarray
+    avg_brightness: np.ndarray
+    motion: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
 
     @property
-    def duration(self) -> float:
-        return max(self.end - self.start, 0.0)
+    def duration(self) -> np.ndarray:
+        return np.maximum(self.end - self.start, 0.0)
 
 
 def parse_args() -> argparse.Namespace:
@@ -34,91 +48,108 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_shots(path: Path) -> List[Shot]:
+def load_shots(path: Path) -> ShotTable:
     if not path.exists():
         raise FileNotFoundError(f"Shots file not found: {path}")
 
-    with path.open("r", encoding="utf-8") as fh:
-        data = json.load(fh)
-
-    shots: List[Shot] = []
-    for item in data:
-        shots.append(
-            Shot(
-                start=float(item.get("start", 0.0)),
-                end=float(item.get("end", 0.0)),
-                avg_brightness=float(item.get("avg_brightness", 0.0)),
-                motion=float(item.get("motion", 0.0)),
-            )
-        )
-    return shots
-
-
-def add_cut_for_long_shots(shot: Shot, events: List[dict], min_duration: float = 5.0) -> None:
-    if shot.duration >= min_duration:
-        midpoint = shot.start + shot.duration / 2.0
-        events.append({"time": round(midpoint, 2), "action": "cut"})
-
-
-def add_glitch_or_shake(shot: Shot, style: str, events: List[dict]) -> None:
-    dark_and_chaotic = shot.avg_brightness < 0.3 and shot.motion > 0.6
-    if not dark_and_chaotic:
-        return
-
-    if style == "analog_horror":
-        events.append({"time": round(shot.start, 2), "action": "glitch", "duration": 0.4, "intensity": "high"})
+    raw = path.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    def column(key: str) -> np.ndarray:
+        return np.array([float(item.get(key, 0.0)) for item in data], dtype=np.float64)
+
+    start = column("start")
+    # The rules compare neighbouring shots and the event streams are merged by time, so shots go in start order
+    order = np.argsort(start, kind="stable")
+    return ShotTable(
+        start=start[order],
+        end=column("end")[order],
+        avg_brightness=column("avg_brightness")[order],
+        motion=column("motion")[order],
+    )
+
+
+def shot_events(shots: ShotTable, style: str, min_cut_duration: float = 5.0) -> Iterator[dict]:
+    """Apply every per-shot rule in a single pass, in time order.
+
+    All rule conditions are evaluated as masks over the columns first; the
+    loop then visits only shots that trigger at least one rule. Within a shot
+    the events are emitted by time: glitch/shake, tension marker and flash at
+    the start, the desync marker shortly after it, then the mid-shot cut.
+    """
+    start = shots.start
+    brightness = shots.avg_brightness
+    motion = shots.motion
+    duration = shots.duration
+
+    dark_and_chaotic = (brightness < 0.3) & (motion > 0.6)
+    if style == "horror_truecrime":
+        styled = (brightness < 0.35) & (motion < 0.4)
+    elif style == "analog_horror":
+        styled = (motion > 0.5) & (brightness < 0.5)
     else:
-        events.append({"time": round(shot.start, 2), "action": "shake", "duration": 0.3, "intensity": "medium"})
-
-
-def add_flash_between_shots(prev_shot: Shot, current_shot: Shot, events: List[dict]) -> None:
-    brightness_jump = current_shot.avg_brightness - prev_shot.avg_brightness
-    if brightness_jump > 0.35:
-        events.append({
-            "time": round(current_shot.start, 2),
-            "action": "flash",
-            "color": "white",
-            "duration": 0.2,
-        })
-
-
-def add_style_markers(shot: Shot, style: str, events: List[dict]) -> None:
-    if style == "horror_truecrime" and shot.avg_brightness < 0.35 and shot.motion < 0.4:
-        events.append({"time": round(shot.start, 2), "action": "marker", "label": "tension_point"})
-    if style == "analog_horror" and shot.motion > 0.5 and shot.avg_brightness < 0.5:
-        events.append({"time": round(shot.start + min(shot.duration * 0.7, 0.5), 2), "action": "marker", "label": "desync"})
-
-
-def add_periodic_markers(shots: Iterable[Shot], events: List[dict], interval: float = 10.0) -> None:
-    next_marker = interval
-    for shot in shots:
-        while shot.start <= next_marker < shot.end:
-            events.append({"time": round(next_marker, 2), "action": "marker", "label": "beat"})
-            next_marker += interval
-
-
-def generate_edit_map(shots: List[Shot], style: str) -> List[dict]:
-    events: List[dict] = []
+        styled = np.zeros(len(shots), dtype=bool)
+    brightness_jump = np.zeros(len(shots), dtype=bool)
+    brightness_jump[1:] = np.diff(brightness) > 0.35
+    long_shot = duration >= min_cut_duration
+
+    idx = np.flatnonzero(dark_and_chaotic | styled | brightness_jump | long_shot)
+    for shot_start, shot_duration, glitch, marker, flash, cut in zip(
+        start[idx].tolist(),
+        duration[idx].tolist(),
+        dark_and_chaotic[idx].tolist(),
+        styled[idx].tolist(),
+        brightness_jump[idx].tolist(),
+        long_shot[idx].tolist(),
+    ):
+        time = round(shot_start, 2)
+        if glitch:
+            if style == "analog_horror":
+                yield {"time": time, "action": "glitch", "duration": 0.4, "intensity": "high"}
+            else:
+                yield {"time": time, "action": "shake", "duration": 0.3, "intensity": "medium"}
+        marker_event = None
+        if marker:
+            if style == "horror_truecrime":
+                marker_event = {"time": time, "action": "marker", "label": "tension_point"}
+            else:
+                desync_time = shot_start + min(shot_duration * 0.7, 0.5)
+                marker_event = {"time": round(desync_time, 2), "action": "marker", "label": "desync"}
+        # A marker at the shot start precedes the flash; a later desync marker follows it
+        if marker_event is not None and marker_event["time"] == time:
+            yield marker_event
+            marker_event = None
+        if flash:
+            yield {"time": time, "action": "flash", "color": "white", "duration": 0.2}
+        if marker_event is not None:
+            yield marker_event
+        if cut:
+            yield {"time": round(shot_start + shot_duration / 2.0, 2), "action": "cut"}
+
+
+def periodic_markers(shots: ShotTable, interval: float = 10.0) -> Iterator[dict]:
+    # Beats are plain timestamps up to the latest shot end; no per-shot walk needed
+    times = np.arange(interval, shots.end.max(), interval)
+    return ({"time": round(t, 2), "action": "marker", "label": "beat"} for t in times.tolist())
+
+
+def generate_edit_map(shots: ShotTable, style: str) -> Iterator[dict]:
+    """Yield the edit events for shots ordered by start time in time order.
+
+    Both event streams are already in time order, so they are merged lazily
+    instead of sorted; on equal times the per-shot events come first. A shot
+    that overlaps the next one can emit events after the next shot starts,
+    so overlapping shots fall back to a stable sort.
+    """
     if not shots:
-        return events
-
-    for idx, shot in enumerate(shots):
-        add_cut_for_long_shots(shot, events)
-        add_glitch_or_shake(shot, style, events)
-        add_style_markers(shot, style, events)
-
-        if idx > 0:
-            add_flash_between_shots(shots[idx - 1], shot, events)
-
-    add_periodic_markers(shots, events)
-    events.sort(key=lambda item: item.get("time", 0.0))
-    return events
-
+        return iter(())
 
-def write_output(edit_map: List[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        json.dump(edit_map, fh, indent=2)
+    if np.any(shots.start[1:] < shots.end[:-1]):
+        events = list(shot_events(shots, style))
+        events.extend(periodic_markers(shots))
+        events.sort(key=lambda item: item["time"])
+        return iter(events)
+    return heapq.merge(shot_events(shots, style), periodic_markers(shots), key=lambda item: item["time"])
 
 
 def main() -> None:
@@ -134,12 +165,11 @@ def main() -> None:
 
     if not shots:
         print("No shots available; generated an empty edit map.", file=sys.stderr)
-        write_output([], output_path)
+        write_json_array([], output_path)
         sys.exit(0)
 
-    edit_map = generate_edit_map(shots, args.style)
-    write_output(edit_map, output_path)
-    print(f"Generated {len(edit_map)} edit events to {output_path}")
+    count = write_json_array(generate_edit_map(shots, args.style), output_path)
+    print(f"Generated {count} edit events to {output_path}")
 
 
 if __name__ == "__main__":
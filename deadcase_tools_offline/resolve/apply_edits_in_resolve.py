@@ -8,6 +8,7 @@ can be added manually.
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from python_get_resolve import GetResolve
@@ -21,6 +22,9 @@ ACTION_COLORS = {
     "marker": "Blue",
 }
 
+# AddMarker is a scripting RPC; a few concurrent calls hide the round-trip latency
+MARKER_WORKERS = 8
+
 
 def seconds_to_frame(seconds: float, fps: float) -> int:
     return int(round(seconds * fps))
@@ -49,15 +53,28 @@ def main() -> None:
 
     fps = float(timeline.GetSetting("timelineFrameRate") or 24.0)
 
+    # Resolve holds one marker per frame and rejects the rest. The first event
+    # of a frame is kept up front, so concurrent calls cannot race for it.
+    calls: dict[int, tuple] = {}
     for event in events:
         seconds = float(event.get("time", 0.0))
         action = event.get("action", "marker")
         label = event.get("label", action)
         color = ACTION_COLORS.get(action, "Blue")
         frame_id = seconds_to_frame(seconds, fps)
-        timeline.AddMarker(frame_id, color, label, str(event))
-
-    print(f"Applied {len(events)} markers from {edit_path}")
+        if frame_id in calls:
+            continue
+        calls[frame_id] = (frame_id, color, label, str(event))
+
+    with ThreadPoolExecutor(max_workers=MARKER_WORKERS) as executor:
+        placed = list(executor.map(lambda args: timeline.AddMarker(*args), calls.values()))
+
+    applied = sum(1 for ok in placed if ok)
+    print(f"Applied {applied} markers from {edit_path}")
+    if len(calls) < len(events):
+        print(f"Skipped {len(events) - len(calls)} events that share a frame with an earlier event.")
+    if applied < len(calls):
+        print(f"Resolve rejected {len(calls) - applied} markers (frame already marked on the timeline?).")
 
 
 if __name__ == "__main__":
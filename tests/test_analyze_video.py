@@ -0,0 +1,132 @@
+"""
+Check that splitting a video across worker processes gives the same shots as a serial run.
+
+Usage:
+    python -m unittest discover tests
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "deadcase_tools_offline"))
+
+import analyze_video  # noqa: E402
+
+FPS = 30.0
+SIZE = (320, 180)
+# A stuck worker fails the test instead of hanging it
+WORKER_TIMEOUT = 120.0
+# (sample_stride, workers, options) per video; one pool each keeps the run short
+CASES = (
+    (1, 3, {}),
+    (2, 8, {"adaptive_k": 0.0}),
+    (3, 2, {"motion_gate": 0.02}),
+)
+
+
+def write_video(path: Path, frames: list[np.ndarray]) -> None:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, SIZE)
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def flicker_frames() -> list[np.ndarray]:
+    # Brightness changes on every frame, so every sampled frame is a cut candidate
+    return [np.full((SIZE[1], SIZE[0], 3), (i * 37) % 230 + 10, np.uint8) for i in range(70)]
+
+
+def dark_scene_frames() -> list[np.ndarray]:
+    # Flat dark scenes of similar brightness with a small moving disc
+    frames = []
+    for scene in range(4):
+        gray = 14 if scene % 2 == 0 else 24
+        for i in range(60):
+            frame = np.full((SIZE[1], SIZE[0], 3), gray, np.uint8)
+            cv2.circle(frame, (60 + i * 3, 90), 12, (gray + 30,) * 3, -1)
+            frames.append(frame)
+    return frames
+
+
+def noisy_scene_frames() -> list[np.ndarray]:
+    # A strobe section followed by noisy scenes of different brightness
+    rng = np.random.default_rng(0)
+    frames = [np.full((SIZE[1], SIZE[0], 3), int(rng.integers(20, 230)), np.uint8) for _ in range(45)]
+    for base in (40, 200, 90, 150):
+        for _ in range(50):
+            frame = np.full((SIZE[1], SIZE[0], 3), base, np.uint8)
+            cv2.add(frame, rng.integers(0, 40, frame.shape, dtype=np.uint8), dst=frame)
+            frames.append(frame)
+    return frames
+
+
+class ParallelMatchesSerialTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.videos = {}
+        for name, frames in (
+            ("flicker", flicker_frames()),
+            ("dark_scenes", dark_scene_frames()),
+            ("noisy_scenes", noisy_scene_frames()),
+        ):
+            path = Path(cls.tmp.name) / f"{name}.avi"
+            write_video(path, frames)
+            cls.videos[name] = path
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp.cleanup()
+
+    def detect(self, path: Path, workers: int, sample_stride: int, **options: float) -> list:
+        source = analyze_video.open_source(path, False, 320, sample_stride)
+        settings = dict(
+            threshold=0.45,
+            min_shot_frames=int(FPS * 0.5),
+            sample_stride=sample_stride,
+            adaptive_k=options.get("adaptive_k", 3.0),
+            motion_gate=options.get("motion_gate", 0.0),
+        )
+        try:
+            if workers == 1:
+                batches = analyze_video.batch_frames(source.frames, analyze_video.BATCH_SIZE)
+                return list(analyze_video.detect_shots(batches, source.fps, **settings))
+            source.release()
+            return list(
+                analyze_video.detect_shots_parallel(
+                    path,
+                    workers,
+                    source.frame_count,
+                    source.fps,
+                    use_pyav=False,
+                    analysis_width=320,
+                    use_opencl=False,
+                    timeout=WORKER_TIMEOUT,
+                    **settings,
+                )
+            )
+        finally:
+            source.release()
+
+    def test_same_shots_as_serial(self) -> None:
+        for name, path in self.videos.items():
+            for sample_stride, workers, options in CASES:
+                with self.subTest(video=name, sample_stride=sample_stride, workers=workers, **options):
+                    serial = self.detect(path, 1, sample_stride, **options)
+                    # ShotMetrics compares the frame ranges and the exact metric sums
+                    self.assertEqual(self.detect(path, workers, sample_stride, **options), serial)
+
+    def test_flicker_shots_respect_min_duration(self) -> None:
+        shots = self.detect(self.videos["flicker"], 8, 1, adaptive_k=0.0)
+        min_shot_frames = int(FPS * 0.5)
+        self.assertTrue(all(shot.frames >= min_shot_frames for shot in shots[:-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()